@@ -1,8 +1,13 @@
 from .routing import versioned_api_route
-from .versioning import VersionedFastAPI, version
+from .versioning import (
+    VersionedFastAPI,
+    version,
+    versioned_fastapi_from_routers,
+)
 
 __all__ = [
     "VersionedFastAPI",
     "versioned_api_route",
+    "versioned_fastapi_from_routers",
     "version",
 ]
@@ -2,17 +2,21 @@ from typing import Any, Type
 
 from fastapi.routing import APIRoute
 
+from .versioning import intern_version
+
 
 def versioned_api_route(
     major: int = 1, minor: int = 0, route_class: Type[APIRoute] = APIRoute
 ) -> Type[APIRoute]:
+    api_version = intern_version(major, minor)
+
     class VersionedAPIRoute(route_class):  # type: ignore
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             super().__init__(*args, **kwargs)
             try:
-                self.endpoint._api_version = (major, minor)
+                self.endpoint._api_version = api_version
             except AttributeError:
                 # Support bound methods
-                self.endpoint.__func__._api_version = (major, minor)
+                self.endpoint.__func__._api_version = api_version
 
     return VersionedAPIRoute
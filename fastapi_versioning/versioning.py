@@ -1,44 +1,188 @@
-from collections import defaultdict
-from typing import Any, Callable, Dict, List, Tuple, TypeVar, cast, Optional, Union
+import json
+from enum import Enum
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from fastapi import FastAPI, HTTPException
-from fastapi.routing import APIRoute
+from fastapi.routing import APIRoute, APIRouter
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
 from fastapi.openapi.utils import get_openapi
-from starlette.routing import BaseRoute
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, Response
+from starlette.routing import BaseRoute, Route, Router, request_response
+from starlette.types import ASGIApp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 CallableT = TypeVar("CallableT", bound=Callable[..., Any])
 
 
+# shared (major, minor) tuples, so version comparisons hit the identity check
+VERSION_POOL: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+
+def intern_version(major: int, minor: int = 0) -> Tuple[int, int]:
+    version = (major, minor)
+    return VERSION_POOL.setdefault(version, version)
+
+
 def version(major: int, minor: int = 0) -> Callable[[CallableT], CallableT]:
     def decorator(func: CallableT) -> CallableT:
-        func._api_version = (major, minor)  # type: ignore
+        func._api_version = intern_version(major, minor)  # type: ignore
         return func
 
     return decorator
 
 
-def version_to_route(
-        route: BaseRoute,
-        default_version: Tuple[int, int],
-) -> Tuple[Tuple[int, int], APIRoute]:
-    api_route = cast(APIRoute, route)
-    version = getattr(api_route.endpoint, "_api_version", default_version)
-    return version, api_route
+DOC_ENDPOINT_EXCEPTION = HTTPException(
+    status_code=400,
+    detail={
+        "msg": "Endpoint only exits for documentation purposes. "
+        "It has no logic."
+    },
+)
+
+
+def doc_endpoint_response() -> NoReturn:
+    # reset the traceback, it would otherwise grow with every raise
+    raise DOC_ENDPOINT_EXCEPTION.with_traceback(None)
+
+
+def openapi_json(openapi_schema: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        # json.dumps converts non-str keys (e.g. from openapi_extra) as well
+        return orjson.dumps(openapi_schema, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        openapi_schema,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def openapi_endpoint(
+        openapi: Callable[[str], Dict[str, Any]]
+) -> Callable[[Request], Awaitable[Response]]:
+    # keyed by root path, since the schema may list it in its servers
+    cached_json: Dict[str, bytes] = {}
+
+    async def endpoint(request: Request) -> Response:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        if root_path not in cached_json:
+            cached_json[root_path] = openapi_json(openapi(root_path))
+        return Response(
+            cached_json[root_path], media_type="application/json"
+        )
+
+    return endpoint
+
+
+def lightweight_doc_urls(
+        app: FastAPI,
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    if not app.openapi_url:
+        return None, None, None
+    return app.openapi_url, app.docs_url, app.redoc_url
 
 
-def doc_endpoint_response() -> HTTPException:
-    raise HTTPException(status_code=400, detail={"msg": "Endpoint only exits for documentation purposes. "
-                                                        "It has no logic."})
+def versioned_sub_app(
+        app: FastAPI,
+        semver: str,
+        routes: List[APIRoute],
+        openapi_tags: List[Dict[str, Any]],
+        lightweight: bool,
+) -> ASGIApp:
+    if not lightweight:
+        versioned_app = FastAPI(
+            title=app.title,
+            description=app.description,
+            version=semver,
+            openapi_tags=None
+        )
+        versioned_app.router.routes.extend(routes)
+        versioned_app.openapi_tags = openapi_tags
+        return versioned_app
 
+    def openapi(root_path: str) -> Dict[str, Any]:
+        return get_openapi(
+            title=app.title,
+            version=semver,
+            description=app.description,
+            routes=routes,
+            tags=openapi_tags,
+            servers=[{"url": root_path}] if root_path else None,
+        )
+
+    async def swagger_ui_html(request: Request) -> HTMLResponse:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        oauth2_redirect_url = app.swagger_ui_oauth2_redirect_url
+        return get_swagger_ui_html(
+            openapi_url=root_path + cast(str, openapi_url),
+            title=app.title + " - Swagger UI",
+            oauth2_redirect_url=(
+                root_path + oauth2_redirect_url
+                if oauth2_redirect_url
+                else None
+            ),
+            init_oauth=app.swagger_ui_init_oauth,
+        )
+
+    async def swagger_ui_redirect(request: Request) -> HTMLResponse:
+        return get_swagger_ui_oauth2_redirect_html()
 
-def remove_non_present_openapi_tags(tags: List[Dict[str, Any]], routes: List[BaseRoute]) -> List[Dict]:
-    return_tags = []
-    for tag in tags:
-        for route in routes:
-            if hasattr(route, "tags") and tag["name"] in route.tags:
-                return_tags.append(tag)
+    async def redoc_html(request: Request) -> HTMLResponse:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_redoc_html(
+            openapi_url=root_path + cast(str, openapi_url),
+            title=app.title + " - ReDoc",
+        )
 
-    return return_tags
+    # the doc routes go first, so they take precedence over the ones of the
+    # original app, which are only part of versions >= default_version
+    doc_routes: List[BaseRoute] = []
+    openapi_url, docs_url, redoc_url = lightweight_doc_urls(app)
+    if openapi_url:
+        doc_routes.append(Route(
+            openapi_url, openapi_endpoint(openapi), include_in_schema=False
+        ))
+    if docs_url:
+        doc_routes.append(
+            Route(docs_url, swagger_ui_html, include_in_schema=False)
+        )
+        if app.swagger_ui_oauth2_redirect_url:
+            doc_routes.append(Route(
+                app.swagger_ui_oauth2_redirect_url,
+                swagger_ui_redirect,
+                include_in_schema=False,
+            ))
+    if redoc_url:
+        doc_routes.append(
+            Route(redoc_url, redoc_html, include_in_schema=False)
+        )
+    return Router(routes=[*doc_routes, *routes])
 
 
 OPENAPI_TAGS_VERSIONED_ENDPOINTS = [
@@ -66,6 +210,7 @@ def VersionedFastAPI(
         enable_latest: bool = False,
         redirect_empty_to_version: Tuple[int, int] = None,
         openapi_tags: Optional[List[Dict[str, Any]]] = None,
+        lightweight_subapps: bool = False,
         **kwargs: Any,
 ) -> FastAPI:
     parent_app = FastAPI(
@@ -73,83 +218,157 @@ def VersionedFastAPI(
         openapi_tags=None,
         **kwargs,
     )
-    version_route_mapping: Dict[Tuple[int, int], List[APIRoute]] = defaultdict(
-        list
-    )
-    version_routes = [
-        version_to_route(route, default_version) for route in app.routes
-    ]
-    doc_endpoints: List[APIRoute] = []
+    default_version = intern_version(*default_version)
+    # built-in doc tags only apply to the parent app, versions need user tags
+    filter_version_tags = bool(openapi_tags)
+    version_routes: List[Tuple[Tuple[int, int], APIRoute]] = []
+    route_tags: Dict[int, FrozenSet[Union[str, Enum]]] = {}
+    for route in app.routes:
+        api_route = cast(APIRoute, route)
+        api_version = getattr(
+            api_route.endpoint, "_api_version", default_version
+        )
+        version_routes.append((api_version, api_route))
+        if filter_version_tags and getattr(route, "tags", None):
+            route_tags[id(route)] = frozenset(api_route.tags)
+    # stable sort, so routes keep their definition order within a version
+    version_routes.sort(key=itemgetter(0))
+    # (path, name, tags, description), routes are built on the first request
+    doc_specs: List[
+        Tuple[str, str, List[Union[str, Enum]], Optional[str]]
+    ] = []
 
-    openapi_tags = openapi_tags if openapi_tags is not None else []
-    openapi_tags += OPENAPI_TAGS_VERSIONED_ENDPOINTS
+    # first definition of a tag name wins
+    tag_by_name: Dict[str, Dict[str, Any]] = {}
+    for tag in (openapi_tags or []) + OPENAPI_TAGS_VERSIONED_ENDPOINTS:
+        tag_by_name.setdefault(tag["name"], tag)
+    openapi_tags = list(tag_by_name.values())
 
-    for version, route in version_routes:
-        version_route_mapping[version].append(route)
+    tags_by_present: Dict[
+        FrozenSet[Union[str, Enum]], List[Dict[str, Any]]
+    ] = {}
 
-    unique_routes = {}
-    versions = sorted(version_route_mapping.keys())
-    for version in versions:
-        major, minor = version
-        prefix = prefix_format.format(major=major, minor=minor)
-        semver = version_format.format(major=major, minor=minor)
-        versioned_app = FastAPI(
-            title=app.title,
-            description=app.description,
-            version=semver,
-            openapi_tags=None
-        )
-        for route in version_route_mapping[version]:
+    def tags_for(
+            present: FrozenSet[Union[str, Enum]],
+    ) -> List[Dict[str, Any]]:
+        if present not in tags_by_present:
+            tags_by_present[present] = [
+                tag for tag in openapi_tags if tag["name"] in present
+            ]
+        return tags_by_present[present]
+
+    # versions also serve the routes of earlier versions they don't override
+    unique_routes: Dict[Tuple[str, str], APIRoute] = {}
+    version_unique_routes: Dict[Tuple[int, int], List[APIRoute]] = {}
+    version_openapi_tags: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    for version, group in groupby(version_routes, key=itemgetter(0)):
+        for _, route in group:
             for method in route.methods:
-                unique_routes[route.path + "|" + method] = route
-        for route in unique_routes.values():
-            versioned_app.router.routes.append(route)
-        versioned_app.openapi_tags = remove_non_present_openapi_tags(openapi_tags, versioned_app.routes)
-        parent_app.mount(prefix, versioned_app)
+                unique_routes[(route.path, method)] = route
+        version_unique_routes[version] = list(unique_routes.values())
+        present: FrozenSet[Union[str, Enum]] = frozenset()
+        if filter_version_tags:
+            present = present.union(*(
+                route_tags[id(route)]
+                for route in version_unique_routes[version]
+                if id(route) in route_tags
+            ))
+        version_openapi_tags[version] = tags_for(present)
+    version_info = [
+        (
+            version,
+            prefix_format.format(major=version[0], minor=version[1]),
+            version_format.format(major=version[0], minor=version[1]),
+        )
+        for version in version_unique_routes
+    ]
+
+    if lightweight_subapps:
+        openapi_url, docs_url, redoc_url = lightweight_doc_urls(app)
+    else:
+        openapi_url, docs_url, redoc_url = "/openapi.json", "/docs", "/redoc"
+    for version, prefix, semver in version_info:
+        parent_app.mount(prefix, versioned_sub_app(
+            app,
+            semver,
+            version_unique_routes[version],
+            version_openapi_tags[version],
+            lightweight_subapps,
+        ))
 
         # also add routes under / if current version is the one that should be redirected to
         if redirect_empty_to_version is not None and redirect_empty_to_version == version:
             # add all routes of current version into parent as well but without prefix
-            for route in unique_routes.values():
-                parent_app.router.routes.append(route)
+            parent_app.router.routes.extend(version_unique_routes[version])
 
             # add dummy endpoint for docs
-            doc_endpoints.append(APIRoute("/*", doc_endpoint_response, name="No Version", tags=["Redirects"],
-                                          description="Requests made to endpoint without version (i.e. directly to "
-                                                      "`/*`) will be redirected to version %s (i.e. `/%s/*`)"
-                                                      % (semver, semver)))
+            doc_specs.append((
+                "/*",
+                "No Version",
+                ["Redirects"],
+                "Requests made to endpoint without version (i.e. directly "
+                "to `/*`) will be redirected to version %s (i.e. `/%s/*`)"
+                % (semver, semver),
+            ))
 
         # add dummy endpoint for docs
-        doc_endpoints.append(APIRoute(
-            f"{prefix}/openapi.json", doc_endpoint_response, name=semver, tags=["Versions"]
-        ))
-        doc_endpoints.append(APIRoute(f"{prefix}/docs", doc_endpoint_response, name="%s Swagger" % semver, tags=["Documentations"]))
-        doc_endpoints.append(APIRoute(f"{prefix}/redoc", doc_endpoint_response, name="%s Redoc" % semver, tags=["Documentations"]))
+        if openapi_url:
+            doc_specs.append(
+                (prefix + openapi_url, semver, ["Versions"], None)
+            )
+        if docs_url:
+            doc_specs.append((
+                prefix + docs_url,
+                "%s Swagger" % semver,
+                ["Documentations"],
+                None,
+            ))
+        if redoc_url:
+            doc_specs.append((
+                prefix + redoc_url,
+                "%s Redoc" % semver,
+                ["Documentations"],
+                None,
+            ))
 
     if enable_latest:
         prefix = "/latest"
-        major, minor = version
-        semver = version_format.format(major=major, minor=minor)
-        versioned_app = FastAPI(
-            title=app.title,
-            description=app.description,
-            version=semver,
-            openapi_tags=None
-        )
-        for route in unique_routes.values():
-            versioned_app.router.routes.append(route)
-        versioned_app.openapi_tags = remove_non_present_openapi_tags(openapi_tags, versioned_app.routes)
-        parent_app.mount(prefix, versioned_app)
+        latest_version, _, semver = version_info[-1]
+        parent_app.mount(prefix, versioned_sub_app(
+            app,
+            semver,
+            version_unique_routes[latest_version],
+            version_openapi_tags[latest_version],
+            lightweight_subapps,
+        ))
 
-        doc_endpoints.append(APIRoute("/latest/*", doc_endpoint_response, name="Latest", tags=["Redirects"],
-                                      description="Requests made to endpoint `/latest/*`) will be "
-                                                  "redirected to latest version, which is %s (i.e. `/%s/*`)" % (
-                                                      semver, semver)))
+        doc_specs.append((
+            "/latest/*",
+            "Latest",
+            ["Redirects"],
+            "Requests made to endpoint `/latest/*`) will be redirected to "
+            "latest version, which is %s (i.e. `/%s/*`)" % (semver, semver),
+        ))
+
+    parent_openapi_tags = tags_for(
+        frozenset(tag for _, _, tags, _ in doc_specs for tag in tags)
+    )
 
     # define custom openapi for parent app, so that it only includes information about different versions.
-    def custom_openapi_for_parent_app():
+    def custom_openapi_for_parent_app() -> Dict[str, Any]:
         if parent_app.openapi_schema:
             return parent_app.openapi_schema
+        doc_endpoints = [
+            APIRoute(
+                path,
+                doc_endpoint_response,
+                response_model=None,
+                name=name,
+                tags=tags,
+                description=description,
+            )
+            for path, name, tags, description in doc_specs
+        ]
         openapi_schema = get_openapi(
             title=parent_app.title,
             version=parent_app.version,
@@ -157,11 +376,54 @@ def VersionedFastAPI(
                                                  "API. Refer to the documentation of a specific version for the actual "
                                                  "documentation, e.g. `/v1.0/redoc`",
             routes=doc_endpoints,
-            tags=remove_non_present_openapi_tags(openapi_tags, doc_endpoints)
+            tags=parent_openapi_tags
         )
         parent_app.openapi_schema = openapi_schema
         return parent_app.openapi_schema
 
     parent_app.openapi = custom_openapi_for_parent_app
+    # replace FastAPI's openapi route, which encodes the schema every request.
+    # The bytes are tied to the schema object parent_app.openapi() returns,
+    # so overriding parent_app.openapi or resetting openapi_schema still works
+    parent_json: List[Tuple[Dict[str, Any], bytes]] = []
+
+    async def parent_openapi(request: Request) -> Response:
+        openapi_schema = parent_app.openapi()
+        if not parent_json or parent_json[0][0] is not openapi_schema:
+            parent_json[:] = [(openapi_schema, openapi_json(openapi_schema))]
+        return Response(parent_json[0][1], media_type="application/json")
+
+    if parent_app.openapi_url:
+        parent_openapi_route = Route(
+            parent_app.openapi_url, parent_openapi, include_in_schema=False
+        )
+        parent_app.router.routes = [
+            parent_openapi_route
+            if getattr(route, "path", None) == parent_app.openapi_url
+            else route
+            for route in parent_app.router.routes
+        ]
 
     return parent_app
+
+
+def versioned_fastapi_from_routers(
+        routers: Iterable[APIRouter],
+        title: str = "FastAPI",
+        description: str = "",
+        **kwargs: Any,
+) -> FastAPI:
+    routes = [route for router in routers for route in router.routes]
+    app = FastAPI(title=title, description=description)
+    app.router.routes.extend(routes)
+    versioned_app = VersionedFastAPI(app, **kwargs)
+    # routes of a bare APIRouter have no app to read dependency overrides
+    # from, bind them to the returned app like include_router would
+    for route in routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.dependency_overrides_provider is None
+        ):
+            route.dependency_overrides_provider = versioned_app
+            route.app = request_response(route.get_route_handler())
+    return versioned_app
@@ -23,5 +23,8 @@ setup(
         "fastapi>=0.56.0",
         "starlette",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+    },
     python_requires=">=3.6",
 )
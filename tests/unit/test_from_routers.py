@@ -0,0 +1,58 @@
+from fastapi import Depends
+from fastapi.routing import APIRouter
+from starlette.testclient import TestClient
+
+from fastapi_versioning import (
+    versioned_api_route,
+    versioned_fastapi_from_routers,
+)
+
+
+def test_from_routers() -> None:
+    router_v1_0 = APIRouter()
+    router_v1_1 = APIRouter(route_class=versioned_api_route(1, 1))
+
+    @router_v1_0.get("/greet")
+    def greet_with_hello() -> str:
+        return "Hello"
+
+    @router_v1_1.get("/greet")
+    def greet_with_hi() -> str:
+        return "Hi"
+
+    @router_v1_1.delete("/greet")
+    def goodbye() -> str:
+        return "Goodbye"
+
+    versioned_app = versioned_fastapi_from_routers(
+        [router_v1_0, router_v1_1], title="My App", enable_latest=True
+    )
+    test_client = TestClient(versioned_app)
+
+    assert versioned_app.title == "My App"
+    assert test_client.get("/v1_0/greet").json() == "Hello"
+    assert test_client.get("/v1_1/greet").json() == "Hi"
+    assert test_client.get("/latest/greet").json() == "Hi"
+    assert test_client.delete("/v1_0/greet").status_code == 405
+    assert test_client.delete("/v1_1/greet").json() == "Goodbye"
+    assert test_client.get("/v1_1/docs").status_code == 200
+
+
+def test_from_routers_dependency_overrides() -> None:
+    router = APIRouter()
+
+    def dep() -> str:
+        return "real"
+
+    @router.get("/dep")
+    def get_dep(value: str = Depends(dep)) -> str:
+        return value
+
+    versioned_app = versioned_fastapi_from_routers([router])
+    test_client = TestClient(versioned_app)
+
+    assert test_client.get("/v1_0/dep").json() == "real"
+    versioned_app.dependency_overrides[dep] = lambda: "override"
+    assert test_client.get("/v1_0/dep").json() == "override"
+    versioned_app.dependency_overrides.clear()
+    assert test_client.get("/v1_0/dep").json() == "real"
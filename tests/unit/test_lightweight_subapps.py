@@ -0,0 +1,152 @@
+from fastapi import FastAPI, HTTPException
+from starlette.testclient import TestClient
+
+from fastapi_versioning import VersionedFastAPI, version
+
+
+def test_lightweight_subapps() -> None:
+    app = FastAPI(title="My App")
+
+    @app.get("/greet", tags=["greetings"])
+    @version(1, 0)
+    def greet_with_hello() -> str:
+        return "Hello"
+
+    @app.get("/greet", tags=["greetings"])
+    @version(1, 1)
+    def greet_with_hi() -> str:
+        return "Hi"
+
+    @app.get("/item/{item_id}")
+    @version(1, 1)
+    def get_item(item_id: int) -> int:
+        raise HTTPException(status_code=404)
+
+    versioned_app = VersionedFastAPI(
+        app,
+        enable_latest=True,
+        lightweight_subapps=True,
+        openapi_tags=[{"name": "greetings", "description": "Greetings."}],
+    )
+    test_client = TestClient(versioned_app)
+
+    assert test_client.get("/v1_0/greet").json() == "Hello"
+    assert test_client.get("/v1_1/greet").json() == "Hi"
+    assert test_client.get("/latest/greet").json() == "Hi"
+    assert test_client.get("/v1_1/item/1").status_code == 404
+    assert test_client.get("/v1_1/item/one").status_code == 422
+
+    assert test_client.get("/v1_0/openapi.json").json()["info"]["version"] == (
+        "1.0"
+    )
+    openapi = test_client.get("/v1_1/openapi.json").json()
+    assert openapi["info"]["version"] == "1.1"
+    assert set(openapi["paths"]) == {"/greet", "/item/{item_id}"}
+    assert openapi["tags"] == [
+        {"name": "greetings", "description": "Greetings."}
+    ]
+
+    parent_openapi = test_client.get("/openapi.json").json()
+    assert "/v1_1/openapi.json" in parent_openapi["paths"]
+
+
+def test_lightweight_subapps_docs() -> None:
+    app = FastAPI()
+
+    @app.get("/greet")
+    @version(1, 0)
+    def greet_with_hello() -> str:
+        return "Hello"
+
+    @app.get("/greet")
+    @version(2, 0)
+    def greet_with_hi() -> str:
+        return "Hi"
+
+    versioned_app = VersionedFastAPI(
+        app, default_version=(2, 0), lightweight_subapps=True
+    )
+    test_client = TestClient(versioned_app)
+
+    for prefix in ("/v1_0", "/v2_0"):
+        docs = test_client.get(f"{prefix}/docs")
+        assert docs.status_code == 200
+        assert f"{prefix}/openapi.json" in docs.text
+        redoc = test_client.get(f"{prefix}/redoc")
+        assert redoc.status_code == 200
+        assert f"{prefix}/openapi.json" in redoc.text
+
+    parent_paths = test_client.get("/openapi.json").json()["paths"]
+    assert "/v1_0/docs" in parent_paths
+    assert "/v1_0/redoc" in parent_paths
+
+
+def test_lightweight_subapps_root_path() -> None:
+    app = FastAPI()
+
+    @app.get("/greet")
+    def greet() -> str:
+        return "Hello"
+
+    root_path = "/custom"
+    versioned_app = VersionedFastAPI(
+        app, root_path=root_path, lightweight_subapps=True
+    )
+    test_client = TestClient(versioned_app, root_path=root_path)
+
+    openapi = test_client.get("/v1_0/openapi.json").json()
+    assert openapi["servers"] == [{"url": "/custom/v1_0"}]
+    assert "/custom/v1_0/openapi.json" in test_client.get("/v1_0/docs").text
+
+
+def test_lightweight_subapps_custom_urls() -> None:
+    app = FastAPI(openapi_url="/api/openapi.json", redoc_url=None)
+
+    @app.get("/greet")
+    @version(1, 1)
+    def greet() -> str:
+        return "Hi"
+
+    versioned_app = VersionedFastAPI(app, lightweight_subapps=True)
+    test_client = TestClient(versioned_app)
+
+    openapi = test_client.get("/v1_1/api/openapi.json").json()
+    assert openapi["info"]["version"] == "1.1"
+    assert set(openapi["paths"]) == {"/greet"}
+    assert "/v1_1/api/openapi.json" in test_client.get("/v1_1/docs").text
+    assert test_client.get("/v1_1/redoc").status_code == 404
+
+    parent_paths = test_client.get("/openapi.json").json()["paths"]
+    assert "/v1_1/api/openapi.json" in parent_paths
+    assert "/v1_1/openapi.json" not in parent_paths
+    assert "/v1_1/redoc" not in parent_paths
+
+
+def test_lightweight_subapps_without_openapi() -> None:
+    app = FastAPI(openapi_url=None)
+
+    @app.get("/greet")
+    def greet() -> str:
+        return "Hello"
+
+    versioned_app = VersionedFastAPI(app, lightweight_subapps=True)
+    test_client = TestClient(versioned_app)
+
+    assert test_client.get("/v1_0/greet").json() == "Hello"
+    assert test_client.get("/v1_0/openapi.json").status_code == 404
+    assert test_client.get("/v1_0/docs").status_code == 404
+    assert test_client.get("/openapi.json").json()["paths"] == {}
+
+
+def test_lightweight_subapps_openapi_extra() -> None:
+    app = FastAPI()
+
+    @app.get("/greet", openapi_extra={"x-codes": {200: "ok"}})
+    def greet() -> str:
+        return "Hello"
+
+    versioned_app = VersionedFastAPI(app, lightweight_subapps=True)
+    test_client = TestClient(versioned_app)
+
+    openapi = test_client.get("/v1_0/openapi.json").json()
+    assert openapi["paths"]["/greet"]["get"]["x-codes"] == {"200": "ok"}
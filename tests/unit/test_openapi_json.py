@@ -0,0 +1,30 @@
+from typing import Any, Dict
+
+from _pytest.monkeypatch import MonkeyPatch
+from starlette.responses import JSONResponse
+
+from fastapi_versioning import versioning
+
+SCHEMA: Dict[str, Any] = {
+    "openapi": "3.0.2",
+    "info": {"title": "Grüße", "version": "1.0"},
+    "paths": {
+        "/greet": {
+            "get": {
+                "tags": ["greetings"],
+                "deprecated": None,
+                "x-codes": {200: "ok"},
+            }
+        }
+    },
+}
+
+
+def test_openapi_json() -> None:
+    assert versioning.openapi_json(SCHEMA) == JSONResponse(SCHEMA).body
+
+
+def test_openapi_json_without_orjson(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(versioning, "orjson", None)
+
+    assert versioning.openapi_json(SCHEMA) == JSONResponse(SCHEMA).body
@@ -0,0 +1,52 @@
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from fastapi_versioning import VersionedFastAPI, version
+
+
+def test_openapi_tags() -> None:
+    app = FastAPI()
+
+    @app.get("/users", tags=["users"])
+    @version(1, 0)
+    def list_users() -> str:
+        return "users"
+
+    @app.get("/users", tags=["people"])
+    @version(1, 1)
+    def list_people() -> str:
+        return "people"
+
+    tags = [
+        {"name": "items", "description": "Not used by any route."},
+        {"name": "users", "description": "Operations with users."},
+        {"name": "users", "description": "Duplicate entry."},
+        {"name": "people", "description": "Operations with people."},
+        {"name": "Versions", "description": "Custom versions description."},
+    ]
+    test_client = TestClient(VersionedFastAPI(app, openapi_tags=tags))
+
+    assert test_client.get("/v1_0/openapi.json").json()["tags"] == [
+        {"name": "users", "description": "Operations with users."},
+    ]
+    assert test_client.get("/v1_1/openapi.json").json()["tags"] == [
+        {"name": "people", "description": "Operations with people."},
+    ]
+    parent_tags = test_client.get("/openapi.json").json()["tags"]
+    assert [tag["name"] for tag in parent_tags] == [
+        "Versions",
+        "Documentations",
+    ]
+    assert parent_tags[0]["description"] == "Custom versions description."
+
+
+def test_openapi_tags_not_given() -> None:
+    app = FastAPI()
+
+    @app.get("/users", tags=["users"])
+    def list_users() -> str:
+        return "users"
+
+    test_client = TestClient(VersionedFastAPI(app))
+
+    assert "tags" not in test_client.get("/v1_0/openapi.json").json()
@@ -0,0 +1,52 @@
+from typing import Any, Dict
+
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from fastapi_versioning import VersionedFastAPI
+
+
+def test_parent_openapi() -> None:
+    test_client = TestClient(VersionedFastAPI(FastAPI()))
+
+    response = test_client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "/v1_0/openapi.json" in response.json()["paths"]
+    assert test_client.get("/openapi.json").content == response.content
+
+
+def test_parent_openapi_custom_url() -> None:
+    test_client = TestClient(
+        VersionedFastAPI(FastAPI(), openapi_url="/api/openapi.json")
+    )
+
+    assert test_client.get("/openapi.json").status_code == 404
+    response = test_client.get("/api/openapi.json")
+    assert "/v1_0/openapi.json" in response.json()["paths"]
+
+
+def test_parent_openapi_disabled() -> None:
+    versioned_app = VersionedFastAPI(FastAPI(), openapi_url=None)
+    test_client = TestClient(versioned_app)
+
+    assert test_client.get("/openapi.json").status_code == 404
+    assert test_client.get("/docs").status_code == 404
+
+
+def test_parent_openapi_override() -> None:
+    versioned_app = VersionedFastAPI(FastAPI())
+    default_openapi = versioned_app.openapi
+    test_client = TestClient(versioned_app)
+
+    def custom_openapi() -> Dict[str, Any]:
+        openapi_schema = default_openapi()
+        openapi_schema["x-custom"] = "value"
+        return openapi_schema
+
+    versioned_app.openapi = custom_openapi  # type: ignore
+    assert test_client.get("/openapi.json").json()["x-custom"] == "value"
+
+    versioned_app.openapi_schema = None
+    versioned_app.openapi = default_openapi  # type: ignore
+    assert "x-custom" not in test_client.get("/openapi.json").json()